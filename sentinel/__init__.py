@@ -1,13 +1,35 @@
+import asyncio
+import atexit
+import collections
+import concurrent.futures
+import inspect
+import json
+import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import threading
-from functools import wraps, reduce
+import time
+from functools import lru_cache, partial, reduce
 import operator
 
+try:
+    import orjson
+except ImportError:  # Optional dependency; fall back to the stdlib encoder.
+    orjson = None
+
+try:
+    import httpx
+    import h2  # noqa: F401  Required by httpx for HTTP/2.
+except ImportError:  # Optional dependency; fall back to the requests session.
+    httpx = None
+
 from .errors import BudgetExceededError
 
 __all__ = [
     "init",
     "wrap",
+    "async_wrap",
     "BudgetExceededError",
 ]
 
@@ -16,46 +38,154 @@ _SENTINEL_CONFIG = {
     "api_key": None,
     "backend_url": "https://api-sentinel-production.up.railway.app/",
     "project_id": None,
-    "monthly_budget": 0,
-    "current_usage": 0,
     "usd_to_inr_rate": 0,
     "pricing_cache": {}, 
+    "flush_interval": 0.25,
+    "max_batch": 50,
 }
 
+class _UsageState:
+    """
+    Budget and usage, tracked as integer micro-units (amount x 1e6) so that
+    accumulation is exact. `budget` keeps the value as the backend sent it,
+    for messages. Always read and updated under _USAGE_LOCK.
+    """
+    __slots__ = ("budget", "budget_micros", "usage_micros")
+
+    def __init__(self):
+        self.budget = 0
+        self.budget_micros = 0
+        self.usage_micros = 0
+
+_KEY_PREFIX = "api-sentinel_pk_"
+_KEY_PREFIX_LEN = len(_KEY_PREFIX)
+
+_MICROS_PER_UNIT = 1_000_000
+_USAGE_STATE = _UsageState()
+_USAGE_LOCK = threading.Lock()
+
+# --- HTTP Session ---
+# Retry policy for backend requests. The HTTP/2 report path reuses the
+# attempt count and backoff, but only for requests that were never sent.
+_RETRY_TOTAL = 3
+_RETRY_BACKOFF = 0.2
+_RETRY_STATUSES = (502, 503, 504)
+# Upper bound on one HTTP/2 report, retries included. Exit waits this long
+# for in-flight reports before closing the client.
+_ASYNC_REPORT_DEADLINE = 15
+
+def _new_session():
+    """Builds the pooled session that keeps connections to the backend alive."""
+    session = requests.Session()
+    http_adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=_RETRY_TOTAL, backoff_factor=_RETRY_BACKOFF, status_forcelist=list(_RETRY_STATUSES)
+        ),
+    )
+    session.mount("https://", http_adapter)
+    session.mount("http://", http_adapter)
+    return session
+
+_SESSION = _new_session()
+
+# --- Usage Reporting State ---
+# Producers append and set the event; deque append/popleft are thread-safe,
+# so neither side takes a lock per record.
+_PENDING_USAGE = collections.deque()
+_USAGE_WAKE = threading.Event()
+_REPORTER_THREAD = None
+_REPORT_EXECUTOR = None
+# When httpx is installed, batches are sent over a single multiplexed HTTP/2
+# connection from an event loop running in its own daemon thread.
+_REPORT_LOOP = None
+_HTTPX_CLIENT = None
+_PENDING_REPORTS = set()
+# Cleared under _DISPATCH_LOCK when the loop starts shutting down, so no batch
+# is scheduled onto a loop that will never run it.
+_REPORT_LOOP_ACCEPTING = False
+_DISPATCH_LOCK = threading.Lock()
+_REPORTER_LOCK = threading.Lock()
+# Set at interpreter exit so the reporter stops collecting before the final drain.
+_REPORTER_STOP = threading.Event()
+_REPORTER_JOIN_TIMEOUT = 5
+
 # --- Public Functions ---
-def init(api_key: str):
+def init(api_key: str, flush_interval: float = 0.25, max_batch: int = 50,
+         force_refresh: bool = False):
     """
     Initializes the Sentinel SDK.
     Fetches generic state (budget, usage, rate) but NOT specific pricing.
+
+    Key verification is cached for the active key, so calling init() again
+    with the same key doesn't hit the backend. Switching keys always
+    re-verifies. Pass `force_refresh=True` to re-verify the same key.
+
+    Usage records are reported in batches: up to `max_batch` records are sent
+    in a single request, or whatever has accumulated after `flush_interval`
+    seconds, whichever comes first.
     """
-    if not api_key or not api_key.startswith("api-sentinel_pk_"):
+    if not (isinstance(api_key, str) and api_key[:_KEY_PREFIX_LEN] == _KEY_PREFIX):
         raise ValueError("A valid Sentinel API key (api-sentinel_pk_...) is required.")
 
+    if flush_interval <= 0 or max_batch < 1:
+        raise ValueError("flush_interval must be positive and max_batch must be at least 1.")
+
+    previous_key = _SENTINEL_CONFIG["api_key"]
     _SENTINEL_CONFIG["api_key"] = api_key
+    _SENTINEL_CONFIG["flush_interval"] = flush_interval
+    _SENTINEL_CONFIG["max_batch"] = max_batch
     
-    print("SENTINEL: Verifying key and fetching initial state...")
-    try:
-        headers = {"X-Sentinel-Key": api_key}
-        response = requests.get(
-            f"{_SENTINEL_CONFIG['backend_url']}/keys/verify",
-            headers=headers, timeout=5
-        )
-        response.raise_for_status()
-        data = response.json()
-        _SENTINEL_CONFIG.update({
-            "project_id": data["project_id"],
-            "monthly_budget": data["monthly_budget"],
-            "current_usage": data["current_usage"],
-            "usd_to_inr_rate": data["usd_to_inr_rate"],
-        })
+    # The cache only ever holds the active key, so a cache hit means this key
+    # has been in use since it was verified and local usage is the newer value.
+    if force_refresh or api_key != previous_key:
+        _verify_key.cache_clear()
+    from_cache = _verify_key.cache_info().currsize > 0
+    data = _verify_key(api_key)
+
+    _SENTINEL_CONFIG.update({
+        "project_id": data["project_id"],
+        "usd_to_inr_rate": data["usd_to_inr_rate"],
+    })
+    with _USAGE_LOCK:
+        _USAGE_STATE.budget = data["monthly_budget"]
+        _USAGE_STATE.budget_micros = _to_micros(data["monthly_budget"])
+        usage_micros = _to_micros(data["current_usage"])
+        if from_cache:
+            # A cached verification predates usage recorded since; never roll it back.
+            usage_micros = max(usage_micros, _USAGE_STATE.usage_micros)
+        _USAGE_STATE.usage_micros = usage_micros
+    if from_cache:
+        print("SENTINEL: Initialization successful. Reusing verified state.")
+    else:
         print("SENTINEL: Initialization successful. State is synced.")
-    except requests.RequestException as e:
-        raise RuntimeError(f"SENTINEL: Could not connect to backend to initialize. Error: {e}")
+
+    _start_reporter()
 
 def wrap(client, adapter):
     """
     Wraps an API client. This function is now fully generic and dynamic.
+    Async clients (e.g. AsyncOpenAI) are detected and wrapped with async_wrap().
+    """
+    # Unwrap first: decorated async methods (e.g. openai's @required_args)
+    # are sync wrappers that return a coroutine.
+    method = inspect.unwrap(_get_nested_attr(client, adapter.method_path))
+    if inspect.iscoroutinefunction(method):
+        return async_wrap(client, adapter)
+    return _wrap_with(client, adapter, _sentinel_call)
+
+def async_wrap(client, adapter):
     """
+    Wraps an async API client. The wrapped method stays a coroutine function,
+    and usage is reported by the same background reporter as wrap().
+    """
+    return _wrap_with(client, adapter, _async_sentinel_call)
+
+# --- Private Helper Functions ---
+
+def _wrap_with(client, adapter, call):
+    """Replaces the adapter's method on the client with `call` bound to it."""
     if not _SENTINEL_CONFIG["api_key"]:
         raise RuntimeError("Sentinel SDK has not been initialized. Please call sentinel.init() first.")
 
@@ -65,27 +195,64 @@ def wrap(client, adapter):
     # Dynamically get the original method using the adapter's specified path
     original_method = _get_nested_attr(client, adapter.method_path)
 
-    @wraps(original_method)
-    def _sentinel_wrapper(*args, **kwargs):
-        if _SENTINEL_CONFIG["current_usage"] >= _SENTINEL_CONFIG["monthly_budget"]:
-            raise BudgetExceededError(f"Project budget of {_SENTINEL_CONFIG['monthly_budget']} exceeded.")
-        
-        response = original_method(*args, **kwargs)
-        
-        try:
-            usage_data = adapter.get_usage_and_cost(response)
-            cost = usage_data["cost"]
-            _SENTINEL_CONFIG["current_usage"] += cost
-            threading.Thread(target=_report_usage_to_backend, args=(usage_data,)).start()
-        except Exception as e:
-            print(f"SENTINEL WARNING: Could not process usage. Error: {e}")
-        return response
+    # The wrapper is a partial over a module-level function, so wrapping a
+    # client doesn't define a new closure or copy metadata with functools.wraps.
+    # State and lock are bound here so the call reads arguments, not globals.
+    # Adapters that don't inherit from BaseAdapter may not offer a fast path.
+    compile_fast_path = getattr(adapter, "compile_fast_path", None)
+    get_usage_and_cost = compile_fast_path() if compile_fast_path else adapter.get_usage_and_cost
+    sentinel_wrapper = partial(
+        call, original_method, get_usage_and_cost, _USAGE_STATE, _USAGE_LOCK
+    )
+    sentinel_wrapper.__wrapped__ = original_method
 
     # Dynamically replace the original method with our new wrapper
-    _set_nested_attr(client, adapter.method_path, _sentinel_wrapper)
+    _set_nested_attr(client, adapter.method_path, sentinel_wrapper)
     return client
 
-# --- Private Helper Functions ---
+def _sentinel_call(original_method, get_usage_and_cost, state, lock, /, *args, **kwargs):
+    """Enforces the budget around a single wrapped API call and records its usage."""
+    _check_budget(state, lock)
+    response = original_method(*args, **kwargs)
+    _record_usage(get_usage_and_cost, state, lock, response)
+    return response
+
+async def _async_sentinel_call(original_method, get_usage_and_cost, state, lock, /, *args, **kwargs):
+    """Async counterpart of _sentinel_call for coroutine methods."""
+    _check_budget(state, lock)
+    response = await original_method(*args, **kwargs)
+    _record_usage(get_usage_and_cost, state, lock, response)
+    return response
+
+def _check_budget(state, lock):
+    """Raises BudgetExceededError if the project has used up its budget."""
+    with lock:
+        budget = state.budget
+        over_budget = state.usage_micros >= state.budget_micros
+    if over_budget:
+        raise BudgetExceededError(f"Project budget of {budget} exceeded.")
+
+def _record_usage(get_usage_and_cost, state, lock, response):
+    """
+    Adds a response's cost to local usage and queues it for reporting.
+    Never blocks on the network, so it is safe to call from an event loop.
+    """
+    try:
+        usage_data = get_usage_and_cost(response)
+        cost_micros = _to_micros(usage_data["cost"])
+        with lock:
+            state.usage_micros += cost_micros
+        _PENDING_USAGE.append(usage_data)
+        _USAGE_WAKE.set()
+        if _REPORTER_THREAD is None:
+            # The reporter doesn't survive fork(); restart it in the child.
+            _start_reporter()
+    except Exception as e:
+        print(f"SENTINEL WARNING: Could not process usage. Error: {e}")
+
+def _to_micros(amount):
+    """Converts a currency amount to integer micro-units."""
+    return int(round(amount * _MICROS_PER_UNIT))
 
 def _get_nested_attr(obj, path):
     """Gets a nested attribute from an object using a dot-separated string."""
@@ -97,6 +264,24 @@ def _set_nested_attr(obj, path, value):
     parent = reduce(getattr, parts[:-1], obj)
     setattr(parent, parts[-1], value)
 
+@lru_cache(maxsize=1)
+def _verify_key(api_key: str) -> dict:
+    """
+    Verifies the key with the backend and returns its initial state.
+    The result for the active key is cached; callers must not mutate it.
+    """
+    print("SENTINEL: Verifying key and fetching initial state...")
+    try:
+        headers = {"X-Sentinel-Key": api_key}
+        response = _SESSION.get(
+            f"{_SENTINEL_CONFIG['backend_url']}/keys/verify",
+            headers=headers, timeout=5
+        )
+        response.raise_for_status()
+        return response.json()
+    except requests.RequestException as e:
+        raise RuntimeError(f"SENTINEL: Could not connect to backend to initialize. Error: {e}")
+
 def _fetch_and_cache_pricing_for_api(api_name: str):
     """
     Fetches and caches the pricing for a specific API, but only if it hasn't been fetched yet.
@@ -106,32 +291,232 @@ def _fetch_and_cache_pricing_for_api(api_name: str):
 
     print(f"SENTINEL: Fetching latest pricing for '{api_name}'...")
     try:
-        pricing_response = requests.get(
+        pricing_response = _SESSION.get(
             f"{_SENTINEL_CONFIG['backend_url']}/v1/public/pricing/{api_name}",
             timeout=5
         )
         pricing_response.raise_for_status()
         pricing_data = pricing_response.json()
         
+        # Pre-bake per-token USD rates. The exchange rate is applied at call
+        # time, so a rate change from init() doesn't invalidate this cache.
         formatted_pricing = {
-            item["model_name"]: {
-                "input": item["input_cost_per_million_usd"],
-                "output": item["output_cost_per_million_usd"]
-            } for item in pricing_data
+            item["model_name"]: (
+                item["input_cost_per_million_usd"] / 1_000_000,
+                item["output_cost_per_million_usd"] / 1_000_000,
+            ) for item in pricing_data
         }
         _SENTINEL_CONFIG["pricing_cache"][api_name] = formatted_pricing
         print(f"SENTINEL: Pricing for '{api_name}' is now cached.")
     except requests.RequestException as e:
         print(f"SENTINEL WARNING: Could not fetch pricing for {api_name}. Costs may be inaccurate. Error: {e}")
 
-def _report_usage_to_backend(usage_data):
-    """Sends the usage data to the Sentinel backend API."""
-    try:
-        headers = {"X-Sentinel-Key": _SENTINEL_CONFIG["api_key"]}
-        response = requests.post(
-            f"{_SENTINEL_CONFIG['backend_url']}/v1/usage",
-            json=usage_data, headers=headers, timeout=5
+def _start_reporter():
+    """
+    Starts the background reporter thread if it isn't already running, along
+    with whatever sends its batches: an HTTP/2 event loop if httpx is
+    available, otherwise a small worker pool.
+    """
+    global _REPORTER_THREAD, _REPORT_EXECUTOR, _REPORT_LOOP, _HTTPX_CLIENT, _REPORT_LOOP_ACCEPTING
+    with _REPORTER_LOCK:
+        if _REPORTER_STOP.is_set():
+            # The interpreter is exiting; _shutdown_reporting drains what's left.
+            return
+        if httpx is not None:
+            if _REPORT_LOOP is None:
+                _REPORT_LOOP = asyncio.new_event_loop()
+                _HTTPX_CLIENT = httpx.AsyncClient(http2=True, timeout=5)
+                threading.Thread(
+                    target=_REPORT_LOOP.run_forever, name="sentinel-http2", daemon=True
+                ).start()
+                _REPORT_LOOP_ACCEPTING = True
+        elif _REPORT_EXECUTOR is None:
+            _REPORT_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+                max_workers=4, thread_name_prefix="sentinel-report"
+            )
+        if _REPORTER_THREAD is not None and _REPORTER_THREAD.is_alive():
+            return
+        _REPORTER_THREAD = threading.Thread(
+            target=_reporter_loop, name="sentinel-reporter", daemon=True
         )
-        response.raise_for_status()
+        _REPORTER_THREAD.start()
+
+def _reporter_loop():
+    """
+    Collects queued usage records and reports them in batches.
+    A batch is sent once it reaches `max_batch` records or `flush_interval` elapses.
+    """
+    while not _REPORTER_STOP.is_set():
+        batch = _collect_batch()
+        if batch:
+            _dispatch_report(batch)
+
+def _dispatch_report(batch):
+    """Hands a batch to the HTTP/2 event loop or the worker pool."""
+    if _REPORT_LOOP is not None:
+        with _DISPATCH_LOCK:
+            if _REPORT_LOOP_ACCEPTING and _REPORT_LOOP.is_running():
+                future = asyncio.run_coroutine_threadsafe(
+                    _async_report_usage_to_backend(batch), _REPORT_LOOP
+                )
+                _PENDING_REPORTS.add(future)
+                future.add_done_callback(_PENDING_REPORTS.discard)
+                return
+        # The loop is stopping at interpreter exit; a scheduled batch would never run.
+        _report_usage_to_backend(batch)
+        return
+    try:
+        _REPORT_EXECUTOR.submit(_report_usage_to_backend, batch)
+    except RuntimeError:
+        # The pool is shut down during interpreter exit; send inline instead.
+        _report_usage_to_backend(batch)
+
+def _stop_report_loop():
+    """Waits for in-flight HTTP/2 reports, then closes the client and stops the loop."""
+    global _REPORT_LOOP_ACCEPTING
+    with _DISPATCH_LOCK:
+        _REPORT_LOOP_ACCEPTING = False
+    concurrent.futures.wait(list(_PENDING_REPORTS), timeout=_ASYNC_REPORT_DEADLINE + 1)
+    try:
+        asyncio.run_coroutine_threadsafe(_HTTPX_CLIENT.aclose(), _REPORT_LOOP).result(timeout=5)
+    except Exception:
+        pass
+    _REPORT_LOOP.call_soon_threadsafe(_REPORT_LOOP.stop)
+
+def _collect_batch():
+    """Blocks until at least one record is pending, then gathers a batch."""
+    # Clear before checking, so a record appended after the check still wakes us.
+    _USAGE_WAKE.clear()
+    if not _PENDING_USAGE:
+        _USAGE_WAKE.wait()
+    max_batch = _SENTINEL_CONFIG["max_batch"]
+    deadline = time.monotonic() + _SENTINEL_CONFIG["flush_interval"]
+    while True:
+        _USAGE_WAKE.clear()
+        remaining = deadline - time.monotonic()
+        if len(_PENDING_USAGE) >= max_batch or remaining <= 0 or _REPORTER_STOP.is_set():
+            break
+        _USAGE_WAKE.wait(remaining)
+    if _REPORTER_STOP.is_set():
+        # Leave pending records to the exit drain, which sends them inline.
+        return []
+    batch = []
+    while _PENDING_USAGE and len(batch) < max_batch:
+        batch.append(_PENDING_USAGE.popleft())
+    return batch
+
+def _drain_usage_queue():
+    """Reports everything still pending on the calling thread."""
+    batch = []
+    while _PENDING_USAGE:
+        batch.append(_PENDING_USAGE.popleft())
+        if len(batch) >= _SENTINEL_CONFIG["max_batch"]:
+            _report_usage_to_backend(batch)
+            batch = []
+    if batch:
+        _report_usage_to_backend(batch)
+
+def _shutdown_reporting():
+    """
+    Flushes usage at interpreter exit. Stops and joins the reporter first, so
+    it can't pop records and send them from a daemon thread that is about to
+    be killed, then lets in-flight reports finish and drains the rest inline.
+    """
+    _REPORTER_STOP.set()
+    _USAGE_WAKE.set()
+    if _REPORTER_THREAD is not None:
+        _REPORTER_THREAD.join(timeout=_REPORTER_JOIN_TIMEOUT)
+    if _REPORT_LOOP is not None:
+        _stop_report_loop()
+    if _REPORT_EXECUTOR is not None:
+        _REPORT_EXECUTOR.shutdown(wait=True)
+    _drain_usage_queue()
+
+def _reset_reporting_after_fork():
+    """
+    Forgets the parent's reporter in a forked child. Its threads, event loop
+    and pooled connections don't carry over (sharing the sockets would mix
+    both processes' traffic), so they are rebuilt lazily on the next record.
+    Records that were pending at fork time are left to the parent.
+    """
+    global _SESSION, _REPORTER_THREAD, _REPORT_EXECUTOR, _REPORT_LOOP, _HTTPX_CLIENT
+    global _REPORT_LOOP_ACCEPTING, _REPORTER_LOCK, _DISPATCH_LOCK, _REPORTER_STOP, _USAGE_WAKE
+    _SESSION = _new_session()
+    _REPORTER_THREAD = None
+    _REPORT_EXECUTOR = None
+    _REPORT_LOOP = None
+    _HTTPX_CLIENT = None
+    _REPORT_LOOP_ACCEPTING = False
+    _PENDING_REPORTS.clear()
+    # Another thread may have held these at fork time; they'd never be released.
+    _REPORTER_LOCK = threading.Lock()
+    _DISPATCH_LOCK = threading.Lock()
+    _REPORTER_STOP = threading.Event()
+    _USAGE_WAKE = threading.Event()
+    # Records pending at fork time are still reported by the parent.
+    _PENDING_USAGE.clear()
+
+atexit.register(_shutdown_reporting)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_reporting_after_fork)
+
+def _dumps(obj) -> bytes:
+    """Serializes a report payload to compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+def _build_report_request(batch):
+    """Returns the URL, body and headers for reporting a batch of usage records."""
+    url = f"{_SENTINEL_CONFIG['backend_url']}/v1/usage/batch"
+    headers = {
+        "X-Sentinel-Key": _SENTINEL_CONFIG["api_key"],
+        "Content-Type": "application/json",
+    }
+    # Costs are kept unrounded on the hot path and rounded once here.
+    for record in batch:
+        record["cost"] = round(record["cost"], 4)
+    return url, _dumps({"items": batch}), headers
+
+def _report_usage_to_backend(batch):
+    """Sends a batch of usage records to the Sentinel backend API."""
+    url, body, headers = _build_report_request(batch)
+    try:
+        response = _SESSION.post(url, data=body, headers=headers, timeout=5)
+        if response.status_code >= 400:
+            print(f"SENTINEL WARNING: Could not report usage to backend. Status: {response.status_code}")
     except requests.RequestException as e:
         print(f"SENTINEL WARNING: Could not report usage to backend. Error: {e}")
+
+async def _async_report_usage_to_backend(batch):
+    """
+    Sends a batch of usage records to the Sentinel backend API over HTTP/2.
+    Only failures where the request was never sent (connect errors and pool
+    timeouts) are retried. Re-sending a batch the backend may already have
+    recorded would bill it twice. The whole report is bounded by
+    _ASYNC_REPORT_DEADLINE so exit can wait for it to finish.
+    """
+    url, body, headers = _build_report_request(batch)
+    try:
+        response = await asyncio.wait_for(
+            _post_with_retries(url, body, headers), _ASYNC_REPORT_DEADLINE
+        )
+        if response.status_code >= 400:
+            print(f"SENTINEL WARNING: Could not report usage to backend. Status: {response.status_code}")
+    except asyncio.TimeoutError:
+        print(f"SENTINEL WARNING: Could not report usage to backend. Timed out after {_ASYNC_REPORT_DEADLINE}s.")
+    except Exception as e:
+        # Nothing awaits this coroutine's result, so anything left uncaught would be lost.
+        print(f"SENTINEL WARNING: Could not report usage to backend. Error: {e}")
+
+async def _post_with_retries(url, body, headers):
+    """Posts over HTTP/2, retrying only failures where nothing was sent."""
+    unsent_errors = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+    for attempt in range(_RETRY_TOTAL + 1):
+        if attempt:
+            await asyncio.sleep(_RETRY_BACKOFF * 2 ** (attempt - 1))
+        try:
+            return await _HTTPX_CLIENT.post(url, content=body, headers=headers)
+        except unsent_errors:
+            if attempt == _RETRY_TOTAL:
+                raise
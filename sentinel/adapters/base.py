@@ -14,7 +14,19 @@ class BaseAdapter:
     def get_usage_and_cost(self, response):
         """
         Processes a successful API response object to extract usage and cost.
+        Must return a flat dict with at least a "cost" key, e.g.
+        {"cost": ..., "input_tokens": ..., "output_tokens": ..., "model": ...}.
+        This record is sent to the backend as-is.
         """
         raise NotImplementedError(
             "Each adapter must implement the 'get_usage_and_cost' method."
-        )
\ No newline at end of file
+        )
+
+    def compile_fast_path(self):
+        """
+        Returns the callable the SDK invokes on every wrapped call to turn a
+        response into usage and cost. Adapters can override this to return a
+        specialized function with its lookups pre-bound; it must return the
+        same data as 'get_usage_and_cost'.
+        """
+        return self.get_usage_and_cost
@@ -1,6 +1,8 @@
 from .base import BaseAdapter
 from .. import _SENTINEL_CONFIG
 
+_ZERO_RATES = (0.0, 0.0)
+
 class OpenAIAdapter(BaseAdapter):
     """
     Adapter for handling responses from the OpenAI API client.
@@ -29,28 +31,49 @@ class OpenAIAdapter(BaseAdapter):
 
         return {
             "cost": cost,
-            "usage_metadata": {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "model": model_name,
+        }
+
+    def compile_fast_path(self):
+        """
+        Returns a straight-line version of 'get_usage_and_cost' with the
+        config, pricing cache and API name bound as locals. Subclasses that
+        override how usage or cost is computed get 'get_usage_and_cost' instead.
+        """
+        cls = type(self)
+        if (cls.get_usage_and_cost is not OpenAIAdapter.get_usage_and_cost
+                or cls._calculate_openai_cost is not OpenAIAdapter._calculate_openai_cost):
+            return self.get_usage_and_cost
+
+        def fast_path(response, _config=_SENTINEL_CONFIG, _cache=_SENTINEL_CONFIG["pricing_cache"],
+                      _api_name=self.api_name, _empty={}, _zero=_ZERO_RATES):
+            usage = response.usage
+            model_name = response.model
+            input_tokens = usage.prompt_tokens
+            output_tokens = usage.completion_tokens
+            input_rate, output_rate = _cache.get(_api_name, _empty).get(model_name, _zero)
+            return {
+                "cost": (input_rate * input_tokens + output_rate * output_tokens)
+                        * _config["usd_to_inr_rate"],
                 "input_tokens": input_tokens,
                 "output_tokens": output_tokens,
                 "model": model_name,
             }
-        }
+
+        return fast_path
 
     def _calculate_openai_cost(self, input_tokens, output_tokens, model_name):
         """
         Calculates cost using the dynamically fetched pricing from the central config.
+        Cached rates are per-token in USD and are converted with the current
+        exchange rate. The result is left unrounded; rounding happens once
+        when usage is reported.
         """
         # Get the pricing for 'openai' from the central cache
-        model_pricing_dict = _SENTINEL_CONFIG["pricing_cache"].get(self.api_name, {})
-        pricing = model_pricing_dict.get(model_name, {"input": 0, "output": 0})
-        
-        input_cost_usd = (input_tokens / 1_000_000) * pricing["input"]
-        output_cost_usd = (output_tokens / 1_000_000) * pricing["output"]
-        
-        total_cost_usd = input_cost_usd + output_cost_usd
-        
-        usd_to_inr_rate = _SENTINEL_CONFIG["usd_to_inr_rate"]
-        total_cost_inr = total_cost_usd * usd_to_inr_rate
-
-        return round(total_cost_inr, 4)
+        model_rates = _SENTINEL_CONFIG["pricing_cache"].get(self.api_name, {})
+        input_rate, output_rate = model_rates.get(model_name, _ZERO_RATES)
 
+        usd_to_inr_rate = _SENTINEL_CONFIG["usd_to_inr_rate"]
+        return (input_rate * input_tokens + output_rate * output_tokens) * usd_to_inr_rate
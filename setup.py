@@ -24,6 +24,12 @@ setup(
         "tiktoken>=0.3.0"
     ],
     extras_require={
+        "fast": [
+            "orjson>=3.0",
+        ],
+        "http2": [
+            "httpx[http2]>=0.23",
+        ],
         "dev": [
             "pytest>=6.0",
             "pytest-cov>=2.0",
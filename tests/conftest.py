@@ -0,0 +1,98 @@
+import threading
+import types
+
+import pytest
+
+import sentinel
+
+_start_reporter = sentinel._start_reporter
+
+
+def make_response(prompt_tokens=1000, completion_tokens=500, model="gpt-test"):
+    """Builds a minimal OpenAI-style chat completion response."""
+    usage = types.SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+    return types.SimpleNamespace(usage=usage, model=model)
+
+
+def make_client(create=None):
+    """Builds a client whose chat.completions.create is `create`."""
+    if create is None:
+        create = lambda **kwargs: make_response()
+    return types.SimpleNamespace(chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=create)))
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, data=None):
+        self.status_code = status_code
+        self._data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._data
+
+
+class FakeSession:
+    """Stands in for the module-level requests session and records calls."""
+
+    def __init__(self):
+        self.verify_data = {
+            "project_id": 1,
+            "monthly_budget": 100,
+            "current_usage": 0,
+            "usd_to_inr_rate": 80,
+        }
+        self.pricing_data = [
+            {"model_name": "gpt-test", "input_cost_per_million_usd": 1, "output_cost_per_million_usd": 2},
+        ]
+        self.gets = []
+        self.posts = []
+        self.post_threads = []
+
+    def get(self, url, **kwargs):
+        self.gets.append(url)
+        if url.endswith("/keys/verify"):
+            return FakeResponse(data=dict(self.verify_data))
+        return FakeResponse(data=self.pricing_data)
+
+    def post(self, url, data=None, **kwargs):
+        self.posts.append((url, data))
+        self.post_threads.append(threading.current_thread().name)
+        return FakeResponse(status_code=202)
+
+
+@pytest.fixture
+def session(monkeypatch):
+    fake = FakeSession()
+    monkeypatch.setattr(sentinel, "_SESSION", fake)
+    # Keep reports on the calling thread so tests can inspect them directly.
+    monkeypatch.setattr(sentinel, "_start_reporter", lambda: None)
+    monkeypatch.setitem(sentinel._SENTINEL_CONFIG, "api_key", None)
+    monkeypatch.setitem(sentinel._SENTINEL_CONFIG, "project_id", None)
+    monkeypatch.setitem(sentinel._SENTINEL_CONFIG, "usd_to_inr_rate", 0)
+    monkeypatch.setitem(sentinel._SENTINEL_CONFIG, "pricing_cache", {})
+    monkeypatch.setitem(sentinel._SENTINEL_CONFIG, "flush_interval", 0.25)
+    monkeypatch.setitem(sentinel._SENTINEL_CONFIG, "max_batch", 50)
+    sentinel._verify_key.cache_clear()
+    sentinel._PENDING_USAGE.clear()
+    sentinel._USAGE_STATE.__init__()
+    yield fake
+    sentinel._verify_key.cache_clear()
+    sentinel._PENDING_USAGE.clear()
+    sentinel._USAGE_STATE.__init__()
+
+
+@pytest.fixture
+def reporter(session, monkeypatch):
+    """Runs the real background reporter, sending through the worker pool."""
+    monkeypatch.setattr(sentinel, "_start_reporter", _start_reporter)
+    monkeypatch.setattr(sentinel, "httpx", None)
+    monkeypatch.setattr(sentinel, "_REPORTER_THREAD", None)
+    monkeypatch.setattr(sentinel, "_REPORT_EXECUTOR", None)
+    monkeypatch.setattr(sentinel, "_REPORT_LOOP", None)
+    monkeypatch.setattr(sentinel, "_REPORTER_STOP", threading.Event())
+    monkeypatch.setattr(sentinel, "_USAGE_WAKE", threading.Event())
+    sentinel._SENTINEL_CONFIG["api_key"] = "api-sentinel_pk_test"
+    yield session
+    sentinel._shutdown_reporting()
@@ -0,0 +1,39 @@
+import sentinel
+from sentinel.adapters import OpenAIAdapter
+
+from .conftest import make_client, make_response
+
+
+def test_fast_path_matches_get_usage_and_cost(session):
+    sentinel.init("api-sentinel_pk_test")
+    sentinel._fetch_and_cache_pricing_for_api("openai")
+    adapter = OpenAIAdapter()
+
+    assert adapter.compile_fast_path()(make_response()) == adapter.get_usage_and_cost(make_response())
+
+
+def test_subclass_cost_override_is_used(session):
+    class FlatRateAdapter(OpenAIAdapter):
+        def _calculate_openai_cost(self, input_tokens, output_tokens, model_name):
+            return 1.0
+
+    sentinel.init("api-sentinel_pk_test")
+    client = sentinel.wrap(make_client(), FlatRateAdapter())
+    client.chat.completions.create(model="gpt-test")
+
+    assert sentinel._USAGE_STATE.usage_micros == 1_000_000
+
+
+def test_adapter_without_base_class(session):
+    class DuckAdapter:
+        api_name = "openai"
+        method_path = "chat.completions.create"
+
+        def get_usage_and_cost(self, response):
+            return {"cost": 2.0}
+
+    sentinel.init("api-sentinel_pk_test")
+    client = sentinel.wrap(make_client(), DuckAdapter())
+    client.chat.completions.create(model="gpt-test")
+
+    assert sentinel._USAGE_STATE.usage_micros == 2_000_000
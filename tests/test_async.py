@@ -0,0 +1,54 @@
+import asyncio
+import functools
+import inspect
+
+import sentinel
+from sentinel.adapters import OpenAIAdapter
+
+from .conftest import make_client, make_response
+
+
+def _sync_decorator(func):
+    # Mirrors decorators like openai's @required_args: a sync wrapper around
+    # an async function, so the wrapper itself isn't a coroutine function.
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return func(*args, **kwargs)
+    return wrapper
+
+
+class AsyncCompletions:
+    async def create(self, **kwargs):
+        await asyncio.sleep(0)
+        return make_response()
+
+
+class DecoratedAsyncCompletions:
+    @_sync_decorator
+    async def create(self, **kwargs):
+        await asyncio.sleep(0)
+        return make_response()
+
+
+async def _call_many(client, count):
+    return await asyncio.gather(*[client.chat.completions.create(model="gpt-test") for _ in range(count)])
+
+
+def test_wrap_detects_async_client(session):
+    sentinel.init("api-sentinel_pk_test")
+    client = sentinel.wrap(make_client(AsyncCompletions().create), OpenAIAdapter())
+
+    assert inspect.iscoroutinefunction(client.chat.completions.create)
+    asyncio.run(_call_many(client, 3))
+    assert sentinel._USAGE_STATE.usage_micros == 480_000
+    assert len(sentinel._PENDING_USAGE) == 3
+
+
+def test_wrap_detects_decorated_async_method(session):
+    sentinel.init("api-sentinel_pk_test")
+    client = sentinel.wrap(make_client(DecoratedAsyncCompletions().create), OpenAIAdapter())
+
+    assert inspect.iscoroutinefunction(client.chat.completions.create)
+    asyncio.run(_call_many(client, 2))
+    assert sentinel._USAGE_STATE.usage_micros == 320_000
+
@@ -0,0 +1,53 @@
+import pytest
+
+import sentinel
+from sentinel.adapters import OpenAIAdapter
+
+from .conftest import make_client
+
+
+def test_wrapped_call_records_usage(session):
+    sentinel.init("api-sentinel_pk_test")
+    client = sentinel.wrap(make_client(), OpenAIAdapter())
+
+    client.chat.completions.create(model="gpt-test")
+
+    # 1000 * 1 + 500 * 2 USD per million tokens, at 80 INR per USD.
+    assert sentinel._USAGE_STATE.usage_micros == 160_000
+    assert list(sentinel._PENDING_USAGE) == [
+        {"cost": pytest.approx(0.16), "input_tokens": 1000, "output_tokens": 500, "model": "gpt-test"}
+    ]
+
+
+def test_budget_exceeded_blocks_call(session):
+    session.verify_data["current_usage"] = 100
+    sentinel.init("api-sentinel_pk_test")
+    calls = []
+    client = sentinel.wrap(make_client(lambda **kwargs: calls.append(kwargs)), OpenAIAdapter())
+
+    with pytest.raises(sentinel.BudgetExceededError, match="Project budget of 100 exceeded."):
+        client.chat.completions.create(model="gpt-test")
+    assert calls == []
+
+
+def test_budget_exceeded_after_usage_crosses_budget(session):
+    session.verify_data["monthly_budget"] = 0.2
+    sentinel.init("api-sentinel_pk_test")
+    client = sentinel.wrap(make_client(), OpenAIAdapter())
+
+    client.chat.completions.create(model="gpt-test")
+    client.chat.completions.create(model="gpt-test")
+    with pytest.raises(sentinel.BudgetExceededError):
+        client.chat.completions.create(model="gpt-test")
+
+
+def test_exchange_rate_change_applies_to_wrapped_clients(session):
+    sentinel.init("api-sentinel_pk_test")
+    client = sentinel.wrap(make_client(), OpenAIAdapter())
+
+    session.verify_data["usd_to_inr_rate"] = 90
+    sentinel.init("api-sentinel_pk_test", force_refresh=True)
+    client.chat.completions.create(model="gpt-test")
+
+    # 0.002 USD at the new rate of 90 INR per USD.
+    assert sentinel._USAGE_STATE.usage_micros == 180_000
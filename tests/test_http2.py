@@ -0,0 +1,130 @@
+import asyncio
+import types
+
+import pytest
+
+import sentinel
+
+
+class FakeTransportError(Exception):
+    pass
+
+
+class FakeConnectError(FakeTransportError):
+    pass
+
+
+class FakeConnectTimeout(FakeTransportError):
+    pass
+
+
+class FakePoolTimeout(FakeTransportError):
+    pass
+
+
+class FakeReadTimeout(FakeTransportError):
+    pass
+
+
+class FakeAsyncClient:
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.posts = 0
+
+    async def post(self, url, content=None, headers=None):
+        self.posts += 1
+        outcome = self.outcomes.pop(0)
+        if outcome == "hang":
+            await asyncio.sleep(60)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return types.SimpleNamespace(status_code=outcome)
+
+
+@pytest.fixture
+def http2(session, monkeypatch):
+    fake_httpx = types.SimpleNamespace(
+        TransportError=FakeTransportError,
+        ConnectError=FakeConnectError,
+        ConnectTimeout=FakeConnectTimeout,
+        PoolTimeout=FakePoolTimeout,
+    )
+    monkeypatch.setattr(sentinel, "httpx", fake_httpx)
+    monkeypatch.setattr(sentinel, "_RETRY_BACKOFF", 0)
+    sentinel._SENTINEL_CONFIG["api_key"] = "api-sentinel_pk_test"
+
+    def use_client(*outcomes):
+        client = FakeAsyncClient(outcomes)
+        monkeypatch.setattr(sentinel, "_HTTPX_CLIENT", client)
+        return client
+
+    return use_client
+
+
+def _batch():
+    return [{"cost": 0.5, "input_tokens": 10, "output_tokens": 5, "model": "gpt-test"}]
+
+
+def test_async_report_retries_unsent_requests(http2, capsys):
+    client = http2(FakeConnectError("refused"), FakePoolTimeout("busy"), FakeConnectTimeout("slow"), 202)
+
+    asyncio.run(sentinel._async_report_usage_to_backend(_batch()))
+
+    assert client.posts == 4
+    assert "WARNING" not in capsys.readouterr().out
+
+
+def test_async_report_gives_up_after_retries(http2, capsys):
+    client = http2(*[FakeConnectError("refused")] * 4)
+
+    asyncio.run(sentinel._async_report_usage_to_backend(_batch()))
+
+    assert client.posts == 4
+    assert "refused" in capsys.readouterr().out
+
+
+def test_async_report_does_not_resend_gateway_errors(http2, capsys):
+    client = http2(503, 202)
+
+    asyncio.run(sentinel._async_report_usage_to_backend(_batch()))
+
+    assert client.posts == 1
+    assert "Status: 503" in capsys.readouterr().out
+
+
+def test_async_report_does_not_resend_after_read_errors(http2, capsys):
+    client = http2(FakeReadTimeout("no response"), 202)
+
+    asyncio.run(sentinel._async_report_usage_to_backend(_batch()))
+
+    assert client.posts == 1
+    assert "no response" in capsys.readouterr().out
+
+
+def test_async_report_warns_on_unexpected_errors(http2, capsys):
+    http2(ValueError("bad url"))
+
+    asyncio.run(sentinel._async_report_usage_to_backend(_batch()))
+
+    assert "bad url" in capsys.readouterr().out
+
+
+def test_async_report_is_bounded_by_deadline(http2, monkeypatch, capsys):
+    monkeypatch.setattr(sentinel, "_ASYNC_REPORT_DEADLINE", 0.05)
+    http2("hang")
+
+    asyncio.run(sentinel._async_report_usage_to_backend(_batch()))
+
+    assert "Timed out after 0.05s." in capsys.readouterr().out
+
+
+def test_dispatch_sends_inline_when_loop_is_stopped(session, monkeypatch):
+    loop = asyncio.new_event_loop()
+    monkeypatch.setattr(sentinel, "_REPORT_LOOP", loop)
+    monkeypatch.setattr(sentinel, "_REPORT_LOOP_ACCEPTING", True)
+    try:
+        sentinel._dispatch_report(_batch())
+    finally:
+        loop.close()
+
+    assert len(session.posts) == 1
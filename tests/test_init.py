@@ -0,0 +1,55 @@
+import pytest
+
+import sentinel
+from sentinel.adapters import OpenAIAdapter
+
+from .conftest import make_client
+
+
+def _verify_calls(session):
+    return sum(url.endswith("/keys/verify") for url in session.gets)
+
+
+def test_init_rejects_malformed_key(session):
+    with pytest.raises(ValueError):
+        sentinel.init("not-a-sentinel-key")
+    with pytest.raises(ValueError):
+        sentinel.init(None)
+
+
+def test_repeated_init_reuses_verification(session, capsys):
+    sentinel.init("api-sentinel_pk_test")
+    sentinel.init("api-sentinel_pk_test")
+
+    assert _verify_calls(session) == 1
+    assert "Reusing verified state." in capsys.readouterr().out
+
+
+def test_force_refresh_reverifies(session):
+    sentinel.init("api-sentinel_pk_test")
+    sentinel.init("api-sentinel_pk_test", force_refresh=True)
+
+    assert _verify_calls(session) == 2
+
+
+def test_repeated_init_keeps_local_usage(session):
+    sentinel.init("api-sentinel_pk_test")
+    client = sentinel.wrap(make_client(), OpenAIAdapter())
+    client.chat.completions.create(model="gpt-test")
+
+    sentinel.init("api-sentinel_pk_test")
+
+    assert sentinel._USAGE_STATE.usage_micros == 160_000
+
+
+def test_switching_keys_reverifies(session):
+    sentinel.init("api-sentinel_pk_a")
+    client = sentinel.wrap(make_client(), OpenAIAdapter())
+    client.chat.completions.create(model="gpt-test")
+    sentinel.init("api-sentinel_pk_b")
+
+    session.verify_data["current_usage"] = 0.16
+    sentinel.init("api-sentinel_pk_a")
+
+    assert _verify_calls(session) == 3
+    assert sentinel._USAGE_STATE.usage_micros == 160_000
@@ -0,0 +1,131 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+import sentinel
+
+
+def _record(cost=0.5):
+    return {"cost": cost, "input_tokens": 10, "output_tokens": 5, "model": "gpt-test"}
+
+
+def _queue(*records):
+    for record in records:
+        sentinel._PENDING_USAGE.append(record)
+        sentinel._USAGE_WAKE.set()
+
+
+def test_collect_batch_stops_at_max_batch(session):
+    sentinel._SENTINEL_CONFIG["max_batch"] = 3
+    sentinel._SENTINEL_CONFIG["flush_interval"] = 10
+    _queue(*[_record() for _ in range(5)])
+
+    start = time.monotonic()
+    batch = sentinel._collect_batch()
+
+    assert len(batch) == 3
+    assert len(sentinel._PENDING_USAGE) == 2
+    assert time.monotonic() - start < 1
+
+
+def test_collect_batch_flushes_after_interval(session):
+    sentinel._SENTINEL_CONFIG["flush_interval"] = 0.05
+    _queue(_record())
+
+    assert len(sentinel._collect_batch()) == 1
+
+
+def test_collect_batch_waits_for_first_record(session):
+    sentinel._SENTINEL_CONFIG["flush_interval"] = 0.05
+    timer = threading.Timer(0.05, _queue, args=(_record(),))
+    timer.start()
+
+    batch = sentinel._collect_batch()
+    timer.join()
+
+    assert len(batch) == 1
+
+
+def test_drain_reports_pending_records_in_batches(session):
+    sentinel._SENTINEL_CONFIG["api_key"] = "api-sentinel_pk_test"
+    sentinel._SENTINEL_CONFIG["max_batch"] = 2
+    _queue(*[_record(0.123456) for _ in range(5)])
+
+    sentinel._drain_usage_queue()
+
+    assert not sentinel._PENDING_USAGE
+    assert [url for url, _ in session.posts] == [sentinel._SENTINEL_CONFIG["backend_url"] + "/v1/usage/batch"] * 3
+    items = [json.loads(body)["items"] for _, body in session.posts]
+    assert [len(batch) for batch in items] == [2, 2, 1]
+    assert items[0][0]["cost"] == 0.1235
+
+
+def test_shutdown_stops_reporter_then_flushes_everything(reporter, monkeypatch):
+    sentinel._SENTINEL_CONFIG["max_batch"] = 2
+    sentinel._SENTINEL_CONFIG["flush_interval"] = 10
+    post = reporter.post
+
+    def slow_post(*args, **kwargs):
+        time.sleep(0.02)
+        return post(*args, **kwargs)
+
+    monkeypatch.setattr(reporter, "post", slow_post)
+    sentinel._start_reporter()
+    _queue(*[_record() for _ in range(7)])
+
+    sentinel._shutdown_reporting()
+
+    assert not sentinel._REPORTER_THREAD.is_alive()
+    assert not sentinel._PENDING_USAGE
+    assert sum(len(json.loads(body)["items"]) for _, body in reporter.posts) == 7
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_forked_child_restarts_reporter(reporter):
+    sentinel._SENTINEL_CONFIG["flush_interval"] = 10
+    sentinel._start_reporter()
+    # Pending in the parent at fork time; only the parent should report it.
+    _queue(_record())
+
+    pid = os.fork()
+    if pid == 0:
+        ok = False
+        try:
+            assert sentinel._REPORTER_THREAD is None and not sentinel._PENDING_USAGE
+            sentinel._SESSION = reporter
+            sentinel._SENTINEL_CONFIG["flush_interval"] = 0.01
+            sentinel._record_usage(lambda response: _record(), sentinel._USAGE_STATE, sentinel._USAGE_LOCK, None)
+            deadline = time.monotonic() + 5
+            while not reporter.posts and time.monotonic() < deadline:
+                time.sleep(0.01)
+            ok = [len(json.loads(body)["items"]) for _, body in reporter.posts] == [1]
+        finally:
+            os._exit(0 if ok else 1)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+
+
+def test_reporter_posts_batches_through_pool(reporter):
+    sentinel._SENTINEL_CONFIG["flush_interval"] = 0.01
+    sentinel._start_reporter()
+    _queue(_record(), _record())
+
+    deadline = time.monotonic() + 5
+    while not reporter.posts and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert [len(json.loads(body)["items"]) for _, body in reporter.posts] == [2]
+    assert reporter.post_threads[0].startswith("sentinel-report")
+
+
+def test_dispatch_sends_inline_after_pool_shutdown(reporter):
+    sentinel._start_reporter()
+    sentinel._REPORT_EXECUTOR.shutdown(wait=True)
+
+    sentinel._dispatch_report([_record()])
+
+    assert len(reporter.posts) == 1